@@ -1,6 +1,7 @@
 from flask import Flask
 from flask_cors import CORS
 from routes.main_routes import bp as main_bp
+from utils.query_log import init_query_log
 import os
 
 app = Flask(__name__)
@@ -9,6 +10,9 @@ CORS(app)
 # blueprint
 app.register_blueprint(main_bp)
 
+# query log (opt-in : QUERY_LOG_PATH)
+init_query_log(app)
+
 if __name__ == "__main__":
     # debug
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
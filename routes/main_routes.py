@@ -1,10 +1,13 @@
-from flask import Blueprint, render_template, jsonify, request
+from flask import Blueprint, render_template, jsonify, request, current_app, g
 from utils.data_utils import (
     load_events,
+    dataset_version,
+    canonical_params,
     filter_by_date,
     filter_by_category,
     normalize_text
 )
+from utils.single_flight import SingleFlight
 import pandas as pd
 import re
 
@@ -13,9 +16,38 @@ import re
 # LOAD DATA ONCE (GLOBAL CACHE)
 # =================================================
 
+# EVENTS_VERSION is part of the coalescing key: refresh it together with
+# EVENTS_DF if the dataframe is ever reloaded
+EVENTS_VERSION = dataset_version()
 EVENTS_DF = load_events()
 
 
+# =================================================
+# REQUEST COALESCING
+# =================================================
+
+SEARCH_FLIGHT = SingleFlight()
+
+
+def coalesced_json(endpoint, compute):
+    """
+    Identical concurrent requests (same endpoint, canonical params and
+    dataset version) share one compute(params) call and its serialized
+    JSON body.
+    """
+    params = canonical_params(request.args)
+    key = (endpoint, EVENTS_VERSION, tuple(params.items()))
+    json_provider = current_app.json
+
+    def serialize():
+        # same body as jsonify (compact outside debug mode)
+        records = compute(params)
+        return json_provider.response(records).get_data(), len(records)
+
+    body, g.query_log_result_count = SEARCH_FLIGHT.do(key, serialize)
+    return current_app.response_class(body, mimetype=json_provider.mimetype)
+
+
 # =================================================
 # CATEGORY NORMALIZATION
 # =================================================
@@ -182,16 +214,21 @@ def api_categories():
         if translated:
             categories.add(translated)
 
+    g.query_log_result_count = len(categories)
     return jsonify(sorted(categories))
 
 
 @bp.route("/api/smart-search")
 def smart_search():
+    return coalesced_json("smart-search", search_events)
+
+
+def search_events(args):
     df = EVENTS_DF
     if df.empty:
-        return jsonify([])
+        return []
 
-    df = apply_filters(df, request.args)
+    df = apply_filters(df, args)
 
     # -----------------------------
     # Ticketmaster UX
@@ -219,7 +256,7 @@ def smart_search():
     # -----------------------------
     # Explicit date sort
     # -----------------------------
-    if request.args.get("sort") == "date" and "DateTime_start" in df.columns:
+    if args.get("sort") == "date" and "DateTime_start" in df.columns:
         df = df.sort_values("DateTime_start", ascending=True)
 
     # -----------------------------
@@ -241,21 +278,25 @@ def smart_search():
     df = df.astype(object)
     df = df.where(pd.notna(df), None)
 
-    return jsonify(df.to_dict(orient="records"))
+    return df.to_dict(orient="records")
 
 
 @bp.route("/api/cities-by-llm")
 def cities_by_llm():
+    return coalesced_json("cities-by-llm", rank_cities)
+
+
+def rank_cities(args):
     df = EVENTS_DF
     if df.empty or "City" not in df.columns:
-        return jsonify([])
+        return []
 
-    df = apply_filters(df, request.args)
+    df = apply_filters(df, args)
 
     df["City"] = df["City"].astype(str).str.strip()
     df = df[df["City"] != ""]
 
-    interests_param = request.args.get("interests", "")
+    interests_param = args.get("interests", "")
     requested_interests = {}
     for part in interests_param.split(","):
         if ":" in part:
@@ -291,4 +332,9 @@ def cities_by_llm():
         ascending=[False, False]
     )
 
-    return jsonify(city_df.to_dict(orient="records"))
+    return city_df.to_dict(orient="records")
+
+
+@bp.route("/api/coalescing-stats")
+def coalescing_stats():
+    return jsonify(SEARCH_FLIGHT.stats())
@@ -2,18 +2,36 @@ from serpapi import GoogleSearch
 import os
 import csv
 import json
+import sys
 import time
+import hashlib
+import argparse
+import pandas as pd
+from datetime import date
 from pathlib import Path
-from dateutil.parser import parse
 from geopy.geocoders import Nominatim
 from googletrans import Translator
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils.date_utils import (
+    ISO_FORMAT, parse_date_range, parse_datetime_series, format_iso
+)
+
 # =====================================================
 # CONFIGURATION
 # =====================================================
 
+parser = argparse.ArgumentParser(description="Google Events scraper (SerpApi)")
+parser.add_argument("--replay", action="store_true",
+                    help="rebuild the dataset from cached SerpApi responses only (no API call)")
+parser.add_argument("--offline", action="store_true",
+                    help="no translation and no live geocoding (geo cache only)")
+parser.add_argument("--output", default="data/csv_fusionne.csv",
+                    help="CSV file the events are appended to")
+args = parser.parse_args()
+
 API_KEY = os.getenv("SERPAPI_API_KEY")
-if not API_KEY:
+if not API_KEY and not args.replay:
     raise ValueError(" SERPAPI_API_KEY non définie")
 
 # MODE TEST : True = arrêt après 1 événement
@@ -22,9 +40,22 @@ TEST_MODE = False
 MAX_EVENTS_PER_QUERY = 5
 TYPES_PER_CITY = 12
 
-OUTPUT_CSV = "data/csv_fusionne.csv"
+OUTPUT_CSV = args.output
 GEO_CACHE_FILE = "geo_cache.json"
 
+# SerpApi responses, one JSON file per (params, run date)
+RESPONSE_CACHE_DIR = "data/serpapi_cache"
+# SerpApi "error" returned for a query without any event
+NO_RESULTS_ERROR = "hasn't returned any results"
+
+# run date of the current run, kept until it completes
+CHECKPOINT_FILE = "data/scrape_checkpoint.json"
+# GitHub Actions run (same for every re-run attempt), empty locally
+RUN_ID = os.getenv("GITHUB_RUN_ID", "")
+
+# Reference day used to infer the year of Google Events dates
+SCRAPE_DATE = date.today()
+
 # =====================================================
 # METHODOLOGICAL NOTE – DATA COLLECTION STRATEGY
 # =====================================================
@@ -109,6 +140,8 @@ def save_geo_cache():
 def translate_fr(text):
     if not text:
         return ""
+    if args.offline:
+        return text
     try:
         return translator.translate(text, src="auto", dest="fr").text
     except:
@@ -119,6 +152,8 @@ def geolocate(address):
         return None, None
     if address in geo_cache:
         return geo_cache[address]
+    if args.offline:
+        return None, None
     try:
         loc = geolocator.geocode(address)
         if loc:
@@ -131,17 +166,92 @@ def geolocate(address):
     save_geo_cache()
     return None, None
 
-def parse_date_range(date_str):
-    if not date_str:
-        return None, None, None
+# =====================================================
+# SERPAPI RESPONSE CACHE & CHECKPOINT
+# =====================================================
+#
+# Each response is stored under the hash of its parameters (API key
+# excluded) and of the run date, so a rerun never spends quota twice for
+# the same query. An interrupted run restarted with the same command
+# re-processes the cached responses (existing_keys drops the events
+# already in the CSV) and only queries SerpApi for the missing ones.
+# The checkpoint keeps the run date so that the cache keys match.
+
+def response_cache_path(params, run_date):
+    public_params = {k: v for k, v in params.items() if k != "api_key"}
+    payload = json.dumps(
+        {"params": public_params, "date": run_date.isoformat()},
+        sort_keys=True, ensure_ascii=False
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return Path(RESPONSE_CACHE_DIR) / f"{digest}.json"
+
+def cached_search(params, run_date, city, event_type):
+    path = response_cache_path(params, run_date)
+    if path.exists():
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["response"]
+
+    results = GoogleSearch(params).get_dict()
+
+    if "error" in results:
+        if NO_RESULTS_ERROR in results["error"]:
+            # a valid empty answer: cached so it is not queried again
+            results = {k: v for k, v in results.items() if k != "error"}
+            results["events_results"] = []
+        else:
+            # quota exhausted, invalid key...: retried on the next run
+            print(f" Erreur SerpApi ({city} — {event_type}) : {results['error']}")
+            return results
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "date": run_date.isoformat(),
+            "city": city,
+            "event_type": event_type,
+            "params": {k: v for k, v in params.items() if k != "api_key"},
+            "response": results,
+        }, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return results
+
+def iter_cached_responses():
+    entries = []
+    for path in Path(RESPONSE_CACHE_DIR).glob("*.json"):
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+        # error payloads cached by earlier versions
+        if "error" not in entry["response"]:
+            entries.append(entry)
+    entries.sort(key=lambda e: (e["date"], e["city"], e["event_type"]))
+    return entries
+
+def load_checkpoint():
+    """
+    Date of the interrupted run to resume, or None. A checkpoint left by
+    another run (other run id, or locally another day) is ignored: its
+    date would give stale cache keys and year inference.
+    """
     try:
-        parts = date_str.split("–")
-        start = parse(parts[0], fuzzy=True)
-        end = parse(parts[1], fuzzy=True) if len(parts) > 1 else None
-        duration = (end - start).total_seconds() / 3600 if end else None
-        return start, end, duration
-    except:
-        return None, None, None
+        with open(CHECKPOINT_FILE, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+
+    run_date = date.fromisoformat(data["date"])
+    if data.get("run_id", "") != RUN_ID:
+        return None
+    if not RUN_ID and run_date != date.today():
+        return None
+    return run_date
+
+def save_checkpoint(run_date):
+    tmp_path = CHECKPOINT_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"date": run_date.isoformat(), "run_id": RUN_ID}, f)
+    os.replace(tmp_path, CHECKPOINT_FILE)
 
 # =====================================================
 # LOADING EXISTING DUPLICATES
@@ -150,16 +260,30 @@ def parse_date_range(date_str):
 existing_keys = set()
 
 csv_path = Path(OUTPUT_CSV)
+
+# data/csv_fusionne.csv is ";"-separated (see load_events): read and
+# append with the delimiter of the existing header
+CSV_DELIMITER = ";"
 if csv_path.exists():
     with open(csv_path, encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            key = (
-                row.get("EventName", "").strip().lower(),
-                row.get("City", "").strip().lower(),
-                row.get("DateTime_start", "")
-            )
-            existing_keys.add(key)
+        header = f.readline()
+        if header and ";" not in header:
+            CSV_DELIMITER = ","
+        f.seek(0)
+        rows = list(csv.DictReader(f, delimiter=CSV_DELIMITER))
+
+    # dates parsed in one pass over the column, then written back in ISO
+    starts = parse_datetime_series(
+        pd.Series([row.get("DateTime_start") or "" for row in rows], dtype=object)
+    )
+    starts_iso = starts.dt.strftime(ISO_FORMAT).fillna("")
+
+    for row, start in zip(rows, starts_iso):
+        existing_keys.add((
+            (row.get("EventName") or "").strip().lower(),
+            (row.get("City") or "").strip().lower(),
+            start
+        ))
 
 # =====================================================
 # WRITING (APPEND)
@@ -169,7 +293,7 @@ os.makedirs("data", exist_ok=True)
 file_exists = csv_path.exists()
 
 with open(csv_path, "a", newline="", encoding="utf-8") as csvfile:
-    writer = csv.writer(csvfile)
+    writer = csv.writer(csvfile, delimiter=CSV_DELIMITER)
 
     if not file_exists:
         writer.writerow([
@@ -178,70 +302,103 @@ with open(csv_path, "a", newline="", encoding="utf-8") as csvfile:
             "Annee_start","Heure_start","Heure_end","lat","lon","duration_h","tags"
         ])
 
-    for ville in villes:
-        types = event_types_by_lang.get(ville["hl"], [])[:TYPES_PER_CITY]
-
-        for event_type in types:
-            print(f" {event_type} — {ville['name']}")
-
-            params = {
-                "engine": "google_events",
-                "api_key": API_KEY,
-                "q": f"{event_type} in {ville['name']}",
-                "location": ville["location"],
-                "gl": ville["gl"],
-                "hl": ville["hl"]
-            }
-
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            events = results.get("events_results", [])[:MAX_EVENTS_PER_QUERY]
-
-            for ev in events:
-                title = translate_fr(ev.get("title", "")).strip()
-                date_raw = ev.get("date", {}).get("when", "")
-                city = ville["name"]
-
-                dt_start, dt_end, duration = parse_date_range(date_raw)
-
-                key = (
-                    title.lower(),
-                    city.lower(),
-                    dt_start.isoformat() if dt_start else ""
-                )
-
-                if key in existing_keys:
-                    continue
-
-                desc = translate_fr(ev.get("description", ""))
-                venue = translate_fr(", ".join(ev.get("address", [])))
-                link = ev.get("link", "")
-                lat, lon = geolocate(venue)
+    def write_events(results, city, event_type, run_date):
+        events = results.get("events_results", [])[:MAX_EVENTS_PER_QUERY]
+        written = 0
+
+        for ev in events:
+            title = translate_fr(ev.get("title", "")).strip()
+            date_raw = ev.get("date", {}).get("when", "")
+
+            dt_start, dt_end, duration = parse_date_range(date_raw, run_date)
+
+            key = (
+                title.lower(),
+                city.lower(),
+                format_iso(dt_start)
+            )
+
+            if key in existing_keys:
+                continue
+
+            desc = translate_fr(ev.get("description", ""))
+            venue = translate_fr(", ".join(ev.get("address", [])))
+            link = ev.get("link", "")
+            lat, lon = geolocate(venue)
+            if not args.offline:
                 time.sleep(1)
 
-                writer.writerow([
-                    "SerpApi", event_type, title, date_raw, city,
-                    venue, venue, link, desc,
-                    dt_start.isoformat() if dt_start else "",
-                    dt_end.isoformat() if dt_end else "",
-                    dt_start.day if dt_start else "",
-                    dt_start.month if dt_start else "",
-                    dt_start.year if dt_start else "",
-                    dt_start.hour if dt_start else "",
-                    dt_end.hour if dt_end else "",
-                    lat, lon, round(duration, 2) if duration else "", event_type
-                ])
-
-                existing_keys.add(key)
+            writer.writerow([
+                "SerpApi", event_type, title, date_raw, city,
+                venue, venue, link, desc,
+                format_iso(dt_start),
+                format_iso(dt_end),
+                dt_start.day if dt_start else "",
+                dt_start.month if dt_start else "",
+                dt_start.year if dt_start else "",
+                dt_start.hour if dt_start else "",
+                dt_end.hour if dt_end else "",
+                lat, lon, round(duration, 2) if duration else "", event_type
+            ])
+
+            existing_keys.add(key)
+            written += 1
+
+            if TEST_MODE:
+                print(" TEST MODE — arrêt après 1 événement")
+                break
+
+        return written
+
+    if args.replay:
+        # -------------------------------------------------
+        # REPLAY : cached responses only, no quota spent
+        # -------------------------------------------------
+        for entry in iter_cached_responses():
+            print(f" [cache {entry['date']}] {entry['event_type']} — {entry['city']}")
+            write_events(
+                entry["response"], entry["city"], entry["event_type"],
+                date.fromisoformat(entry["date"])
+            )
+            if TEST_MODE:
+                break
+
+    else:
+        checkpoint_date = load_checkpoint()
+        if checkpoint_date:
+            # resume the interrupted run with its own date (same cache keys)
+            SCRAPE_DATE = checkpoint_date
+            print(f" Reprise du run du {SCRAPE_DATE}")
+        save_checkpoint(SCRAPE_DATE)
+
+        for ville in villes:
+            types = event_types_by_lang.get(ville["hl"], [])[:TYPES_PER_CITY]
+
+            for event_type in types:
+                print(f" {event_type} — {ville['name']}")
+
+                params = {
+                    "engine": "google_events",
+                    "api_key": API_KEY,
+                    "q": f"{event_type} in {ville['name']}",
+                    "location": ville["location"],
+                    "gl": ville["gl"],
+                    "hl": ville["hl"]
+                }
+
+                results = cached_search(params, SCRAPE_DATE, ville["name"], event_type)
+                write_events(results, ville["name"], event_type, SCRAPE_DATE)
+
+                csvfile.flush()
 
                 if TEST_MODE:
-                    print(" TEST MODE — arrêt après 1 événement")
                     break
-
             if TEST_MODE:
                 break
-        if TEST_MODE:
-            break
+
+        # run complete : the next run starts from scratch
+        if os.path.exists(CHECKPOINT_FILE):
+            os.remove(CHECKPOINT_FILE)
 
 print(f" Scraping terminé — données ajoutées à {OUTPUT_CSV}")
 
@@ -0,0 +1,188 @@
+"""
+Replay captured API queries (see utils/query_log.py) against the app.
+
+    python tools/replay_queries.py logs/queries.jsonl*
+    python tools/replay_queries.py logs/queries.jsonl --concurrency 16
+    python tools/replay_queries.py logs/queries.jsonl --url http://127.0.0.1:8000
+
+Without --url the Flask test client is used (in-process); with --url the
+requests go over HTTP, e.g. to a local `gunicorn app:app`.
+Reports throughput, p50/p95/p99 latency, error rate (5xx and transport
+failures) and 4xx rate per endpoint.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+# =====================================================
+# LOADING LOGS
+# =====================================================
+
+def rotation_index(path):
+    # queries.jsonl -> 0, queries.jsonl.1 -> 1, queries.jsonl.10 -> 10
+    suffix = Path(path).suffix.lstrip(".")
+    return int(suffix) if suffix.isdigit() else 0
+
+
+def load_queries(paths, limit=None):
+    queries = []
+    # rotated files (queries.jsonl.10 ... .1) are older than the live one
+    for path in sorted(paths, key=lambda p: (-rotation_index(p), str(p))):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if "path" in entry:
+                    queries.append((entry["path"], entry.get("params", {})))
+    return queries[:limit] if limit else queries
+
+
+# =====================================================
+# CLIENTS
+# =====================================================
+
+def make_test_client_sender():
+    # replayed traffic must not be logged again
+    os.environ.pop("QUERY_LOG_PATH", None)
+    sys.path.insert(0, str(ROOT_DIR))
+    from app import app
+
+    local = threading.local()
+
+    def send(path, params):
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        response = local.client.get(path, query_string=params)
+        return response.status_code
+
+    return send
+
+
+def make_http_sender(base_url, timeout):
+    base_url = base_url.rstrip("/")
+
+    def send(path, params):
+        url = f"{base_url}{path}"
+        if params:
+            url += "?" + urlencode(params)
+        try:
+            with urlopen(url, timeout=timeout) as response:
+                response.read()
+                return response.status
+        except HTTPError as e:
+            return e.code
+        except URLError:
+            return None
+
+    return send
+
+
+# =====================================================
+# REPLAY
+# =====================================================
+
+def replay(queries, send, concurrency):
+    def run(query):
+        path, params = query
+        start = time.perf_counter()
+        try:
+            status = send(path, params)
+        except Exception:
+            status = None
+        return path, status, (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(run, queries))
+    return results, time.perf_counter() - start
+
+
+def summarize(results, elapsed):
+    by_path = defaultdict(list)
+    for path, status, latency_ms in results:
+        by_path[path].append((status, latency_ms))
+    by_path["TOTAL"] = [(s, l) for _, s, l in results]
+
+    rows = []
+    for path, items in sorted(by_path.items()):
+        latencies = np.array([l for _, l in items])
+        errors = sum(1 for s, _ in items if s is None or s >= 500)
+        client_errors = sum(1 for s, _ in items if s is not None and 400 <= s < 500)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        rows.append({
+            "endpoint": path,
+            "requests": len(items),
+            "throughput_rps": round(len(items) / elapsed, 1) if elapsed else None,
+            "p50_ms": round(p50, 1),
+            "p95_ms": round(p95, 1),
+            "p99_ms": round(p99, 1),
+            "error_rate": round(errors / len(items), 4),
+            "client_error_rate": round(client_errors / len(items), 4),
+        })
+    return rows
+
+
+def print_report(rows, elapsed, concurrency):
+    print(f"Durée : {elapsed:.2f}s — concurrence : {concurrency}")
+    header = f"{'endpoint':<28}{'req':>7}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'err%':>8}{'4xx%':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(
+            f"{r['endpoint']:<28}{r['requests']:>7}{r['throughput_rps']:>9}"
+            f"{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}"
+            f"{r['error_rate'] * 100:>7.2f}%"
+            f"{r['client_error_rate'] * 100:>7.2f}%"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay captured CityMatch API queries")
+    parser.add_argument("logs", nargs="+", help="JSONL query log files (rotated files accepted)")
+    parser.add_argument("--url", help="base URL (e.g. http://127.0.0.1:8000); default: Flask test client")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--limit", type=int, help="replay only the first N queries")
+    parser.add_argument("--repeat", type=int, default=1, help="replay the log N times")
+    parser.add_argument("--timeout", type=float, default=30.0, help="HTTP timeout (s)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    queries = load_queries(args.logs, args.limit) * args.repeat
+    if not queries:
+        print("Aucune requête à rejouer")
+        return 1
+
+    send = make_http_sender(args.url, args.timeout) if args.url else make_test_client_sender()
+
+    results, elapsed = replay(queries, send, args.concurrency)
+    rows = summarize(results, elapsed)
+
+    if args.json:
+        print(json.dumps({"elapsed_s": round(elapsed, 3), "endpoints": rows}, indent=2))
+    else:
+        print_report(rows, elapsed, args.concurrency)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
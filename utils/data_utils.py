@@ -2,6 +2,7 @@ import pandas as pd
 import unicodedata
 import re
 import os
+from utils.date_utils import parse_datetime_series
 
 # =================================================
 # CONFIGURATION PATH
@@ -29,6 +30,37 @@ def normalize_text(value) -> str:
     return value
 
 
+# =================================================
+# CANONICAL REQUEST PARAMETERS
+# =================================================
+
+def canonical_params(args) -> dict:
+    """
+    Request args -> sorted dict without empty values, so that two
+    requests asking the same thing produce the same parameters.
+    """
+    params = {}
+    for key in sorted(args.keys()):
+        value = args.get(key, "")
+        if isinstance(value, str):
+            value = value.strip()
+        if value:
+            params[key] = value
+    return params
+
+
+# =================================================
+# DATASET VERSION
+# =================================================
+
+def dataset_version() -> str:
+    """Changes whenever the CSV file is rewritten (mtime + size)."""
+    if not os.path.exists(CSV_PATH):
+        return "absent"
+    stat = os.stat(CSV_PATH)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
 # =================================================
 # LOAD EVENTS (ROBUST & SAFE)
 # =================================================
@@ -64,32 +96,14 @@ def load_events() -> pd.DataFrame:
     df["lon"] = pd.to_numeric(df.get("lon"), errors="coerce")
 
     # =================================================
-    # PARSING DES DATES — JOURNÉE SEULE (SANS HEURE)
+    # PARSING DES DATES — FORMATS EXPLICITES, HEURE CONSERVÉE
     # =================================================
 
-    if "DateTime_start" in df.columns:
-        df["DateTime_start"] = (
-            pd.to_datetime(
-                df["DateTime_start"],    
-                dayfirst=True,
-                errors="coerce"
-            )
-            .dt.normalize()        
-        )
-    else:
-        df["DateTime_start"] = pd.NaT
-
-    if "DateTime_end" in df.columns:
-        df["DateTime_end"] = (
-            pd.to_datetime(
-                df["DateTime_end"],
-                dayfirst=True,
-                errors="coerce"
-            )
-            .dt.normalize()
-        )
-    else:
-        df["DateTime_end"] = pd.NaT
+    for col in ["DateTime_start", "DateTime_end"]:
+        if col in df.columns:
+            df[col] = parse_datetime_series(df[col])
+        else:
+            df[col] = pd.NaT
 
     # Sécurité texte
     for col in ["Category", "City", "EventName", "Description"]:
@@ -151,10 +165,8 @@ def filter_by_date(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
 
     df = df.copy()
 
-
-    df["DateTime_start"] = pd.to_datetime(
-        df["DateTime_start"], errors="coerce"
-    )
+    if not pd.api.types.is_datetime64_any_dtype(df["DateTime_start"]):
+        df["DateTime_start"] = parse_datetime_series(df["DateTime_start"])
 
     today = pd.Timestamp.now().normalize()
 
@@ -167,9 +179,11 @@ def filter_by_date(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
             df = df[df["DateTime_start"] >= start]
 
 
+    # end est une journée : inclusive jusqu'à 23:59:59
     if end:
         end = pd.to_datetime(end, errors="coerce")
         if pd.notna(end):
-            df = df[df["DateTime_start"] <= end]
+            end_exclusive = end.normalize() + pd.Timedelta(days=1)
+            df = df[df["DateTime_start"] < end_exclusive]
 
     return df
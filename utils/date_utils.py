@@ -0,0 +1,378 @@
+import pandas as pd
+import unicodedata
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+# =================================================
+# FORMATS CONNUS
+# =================================================
+
+# Single ISO form used everywhere data is written
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+# (detection regex, explicit strptime format), checked in order
+KNOWN_FORMATS = [
+    (r"^\d{1,2}/\d{1,2}/\d{4} \d{1,2}:\d{2}$", "%d/%m/%Y %H:%M"),
+    (r"^\d{1,2}/\d{1,2}/\d{4}$", "%d/%m/%Y"),
+    (r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}$", "%Y-%m-%dT%H:%M:%S"),
+    (r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}$", "%Y-%m-%dT%H:%M"),
+    (r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$", "%Y-%m-%d %H:%M:%S"),
+    (r"^\d{4}-\d{2}-\d{2}$", "%Y-%m-%d"),
+]
+
+# Month abbreviations (accents stripped, lower case) for the languages
+# queried by the scraper. Lookup tries the 4-letter prefix, then 3 letters.
+MONTHS = {
+    "jan": 1, "ene": 1, "gen": 1,
+    "feb": 2, "fev": 2,
+    "mar": 3, "maa": 3, "mrt": 3,
+    "apr": 4, "avr": 4, "abr": 4,
+    "may": 5, "mai": 5, "mag": 5, "mei": 5, "maj": 5,
+    "jun": 6, "juin": 6, "giu": 6,
+    "jul": 7, "juil": 7, "lug": 7,
+    "aug": 8, "aou": 8, "ago": 8,
+    "sep": 9, "set": 9,
+    "oct": 10, "okt": 10, "ott": 10, "out": 10,
+    "nov": 11,
+    "dec": 12, "dez": 12, "dic": 12, "des": 12,
+}
+
+RANGE_SEPARATOR = re.compile(r"\s*(?:–|—|\s-\s)\s*")
+# UTF-8 dashes read as cp1252 (as in the DateTime column of the CSV);
+# repaired before accents are stripped, which would turn "â" into "a"
+MOJIBAKE = {"â€“": "–", "â€”": "—"}
+TIMEZONE_SUFFIX = re.compile(r"\b(?:gmt|utc)\s*[+-]?\d{0,2}(?::?\d{2})?\b")
+DAY_MONTH = re.compile(
+    r"(\d{1,2})\.?\s*(?:de\s+)?([a-z]+)\.?(?:,?\s+(?:de\s+)?(\d{4}))?"
+)
+MONTH_DAY = re.compile(r"([a-z]+)\.?\s+(\d{1,2})(?:,?\s+(\d{4}))?")
+LONE_DAY = re.compile(r"^(?:[a-z]+\.?,?\s+)?(\d{1,2})\.?$")
+# "14:00", "7:30 pm", "8 pm" (minutes optional only with am/pm)
+TIME = re.compile(
+    r"\b(\d{1,2})(?::(\d{2})(?:\s*([ap])\.?m\b\.?)?|\s*([ap])\.?m\b\.?)"
+)
+# "Today, 14:00" / "Demain, 20:00": days relative to the reference day
+RELATIVE_DAYS = {
+    "today": 0, "tonight": 0, "aujourd'hui": 0, "aujourd’hui": 0,
+    "heute": 0, "hoy": 0, "oggi": 0, "vandaag": 0, "hoje": 0,
+    "idag": 0, "i dag": 0,
+    "tomorrow": 1, "demain": 1, "morgen": 1, "manana": 1, "domani": 1,
+    "amanha": 1, "imorgon": 1, "i morgon": 1, "i morgen": 1,
+}
+RELATIVE_DAY = re.compile(
+    r"(?<![a-z])(" + "|".join(
+        re.escape(word) for word in sorted(RELATIVE_DAYS, key=len, reverse=True)
+    ) + r")(?![a-z])"
+)
+# "Fri, Mar 6, 7 – 10 PM": bare hour left after the date
+BARE_HOUR = re.compile(r"(?:^|[\s,])(\d{1,2})\s*$")
+
+# Real Google Events "when" strings -> (start, end, duration_h), with the
+# reference day date(2026, 1, 10). Checked by running this module.
+DATE_RANGE_EXAMPLES = [
+    ("Thu 15 Jan, 14:00–16:00",
+     (datetime(2026, 1, 15, 14, 0), datetime(2026, 1, 15, 16, 0), 2.0)),
+    ("Sa., 17. Jan., 14:00–16:00 Uhr",
+     (datetime(2026, 1, 17, 14, 0), datetime(2026, 1, 17, 16, 0), 2.0)),
+    ("sáb, 17 ene, 14:00–16:00",
+     (datetime(2026, 1, 17, 14, 0), datetime(2026, 1, 17, 16, 0), 2.0)),
+    ("16 de ene., 20:00",
+     (datetime(2026, 1, 16, 20, 0), None, None)),
+    ("Thu 15 Jan, 14:00â€“16:00",
+     (datetime(2026, 1, 15, 14, 0), datetime(2026, 1, 15, 16, 0), 2.0)),
+    ("Sat 24 Jan, 10:00 – Sun 25 Jan, 17:00",
+     (datetime(2026, 1, 24, 10, 0), datetime(2026, 1, 25, 17, 0), 31.0)),
+    ("Sun 18 Jan, 15:00–17:00 GMT-8",
+     (datetime(2026, 1, 18, 15, 0), datetime(2026, 1, 18, 17, 0), 2.0)),
+    ("Fri 13 Feb, 22:00–01:00",
+     (datetime(2026, 2, 13, 22, 0), datetime(2026, 2, 14, 1, 0), 3.0)),
+    ("Fri, Jan 16, 8 PM",
+     (datetime(2026, 1, 16, 20, 0), None, None)),
+    ("Mon, Jan 19, 7:30 – 9:30 PM",
+     (datetime(2026, 1, 19, 19, 30), datetime(2026, 1, 19, 21, 30), 2.0)),
+    ("Fri, Mar 6, 7 – 10 PM",
+     (datetime(2026, 3, 6, 19, 0), datetime(2026, 3, 6, 22, 0), 3.0)),
+    ("Sat, Jan 17, 11:00 AM – 1:00 PM",
+     (datetime(2026, 1, 17, 11, 0), datetime(2026, 1, 17, 13, 0), 2.0)),
+    ("lör 16 maj, 14:00–16:00",
+     (datetime(2026, 5, 16, 14, 0), datetime(2026, 5, 16, 16, 0), 2.0)),
+    ("16. maj 2026",
+     (datetime(2026, 5, 16), None, None)),
+    ("za 14 mrt, 20:00",
+     (datetime(2026, 3, 14, 20, 0), None, None)),
+    ("Today, 14:00",
+     (datetime(2026, 1, 10, 14, 0), None, None)),
+    ("Tomorrow, 20:00 – 22:00",
+     (datetime(2026, 1, 11, 20, 0), datetime(2026, 1, 11, 22, 0), 2.0)),
+    ("Aujourd’hui, 20:00",
+     (datetime(2026, 1, 10, 20, 0), None, None)),
+    ("Morgen, 19:30–22:00 Uhr",
+     (datetime(2026, 1, 11, 19, 30), datetime(2026, 1, 11, 22, 0), 2.5)),
+    ("mañana, 21:00",
+     (datetime(2026, 1, 11, 21, 0), None, None)),
+    ("Tomorrow, 8 – 10 PM",
+     (datetime(2026, 1, 11, 20, 0), datetime(2026, 1, 11, 22, 0), 2.0)),
+    ("15 Jan – 12 Feb",
+     (datetime(2026, 1, 15), datetime(2026, 2, 12), 672.0)),
+    ("9–19 may 2026",
+     (datetime(2026, 5, 9), datetime(2026, 5, 19), 240.0)),
+    ("Fr., 16. – So., 18. Jan.",
+     (datetime(2026, 1, 16), datetime(2026, 1, 18), 48.0)),
+    ("12.–14. Jan. 2026",
+     (datetime(2026, 1, 12), datetime(2026, 1, 14), 48.0)),
+    ("28. Dez. 2025 – 9. Jan. 2026",
+     (datetime(2025, 12, 28), datetime(2026, 1, 9), 288.0)),
+    ("Sun 28 Dec – Sat 3 Jan",
+     (datetime(2026, 12, 28), datetime(2027, 1, 3), 144.0)),
+    ("Sa., 9. Jan.",
+     (datetime(2026, 1, 9), None, None)),
+    ("", (None, None, None)),
+]
+
+
+# =================================================
+# VECTORIZED PARSING (CSV)
+# =================================================
+
+def parse_datetime_series(series: pd.Series) -> pd.Series:
+    """
+    Parse a column of date strings into datetime64 values.
+
+    The format of the first non-blank value is tried on the whole column
+    with a single pd.to_datetime call (the common case: one format for
+    every row). Mixed columns are parsed once per distinct raw string,
+    grouped by detected format, each group with an explicit format.
+    Values matching no known format become NaT: Google Events strings
+    have no year, which is only inferred by the scraper (parse_date_range
+    with the run date), never at load time. Hours are kept.
+    """
+    if series.empty:
+        return pd.to_datetime(series, errors="coerce")
+
+    if series.dtype == object or pd.api.types.is_string_dtype(series):
+        sample = next(
+            (v for v in series if isinstance(v, str) and v.strip()),
+            None
+        )
+        fmt = _detect_format(sample) if sample is not None else None
+        if fmt is not None:
+            try:
+                return pd.to_datetime(series, format=fmt, errors="raise")
+            except (ValueError, TypeError):
+                pass
+
+    raw = series.astype("string").str.strip()
+    uniques = pd.Series(raw.dropna().unique(), dtype="string")
+
+    # e.g. a column blank on every row, read by pandas as float NaN
+    if uniques.empty:
+        return pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+
+    parsed = pd.Series(pd.NaT, index=uniques.index, dtype="datetime64[ns]")
+    remaining = pd.Series(True, index=uniques.index)
+
+    for pattern, fmt in KNOWN_FORMATS:
+        mask = remaining & uniques.str.match(pattern).fillna(False)
+        if mask.any():
+            parsed[mask] = pd.to_datetime(
+                uniques[mask], format=fmt, errors="coerce"
+            )
+            remaining &= ~mask
+
+    lookup = dict(zip(uniques, parsed))
+    return pd.to_datetime(raw.map(lookup), errors="coerce")
+
+
+def _detect_format(value: str):
+    for pattern, fmt in KNOWN_FORMATS:
+        if re.match(pattern, value):
+            return fmt
+    return None
+
+
+def format_iso(value) -> str:
+    """Write-side normalization: datetime-like -> ISO string, missing -> ''."""
+    if value is None or pd.isna(value):
+        return ""
+    return pd.Timestamp(value).strftime(ISO_FORMAT)
+
+
+# =================================================
+# GOOGLE EVENTS STRINGS
+# =================================================
+
+def _strip_accents(value: str) -> str:
+    value = unicodedata.normalize("NFD", value)
+    return "".join(c for c in value if not unicodedata.combining(c))
+
+
+def _month_number(token: str):
+    return MONTHS.get(token[:4]) or MONTHS.get(token[:3])
+
+
+def _apply_meridiem(hour: int, meridiem) -> int:
+    if meridiem == "p" and hour < 12:
+        return hour + 12
+    if meridiem == "a" and hour == 12:
+        return 0
+    return hour
+
+
+def _parse_side(text: str) -> dict:
+    """Extract day / month / year / hour / minute found in one side of a range."""
+    parts = {}
+
+    time_match = TIME.search(text)
+    if time_match:
+        hour, minute, meridiem, bare_meridiem = time_match.groups()
+        meridiem = meridiem or bare_meridiem
+        parts["hour"] = _apply_meridiem(int(hour), meridiem)
+        parts["minute"] = int(minute) if minute else 0
+        if meridiem:
+            parts["meridiem"] = meridiem
+        text = text[:time_match.start()] + " " + text[time_match.end():]
+
+    date_match = None
+    for match in DAY_MONTH.finditer(text):
+        month = _month_number(match.group(2))
+        if month:
+            parts["day"], parts["month"] = int(match.group(1)), month
+            date_match = match
+            break
+
+    if date_match is None:
+        for match in MONTH_DAY.finditer(text):
+            month = _month_number(match.group(1))
+            if month:
+                parts["day"], parts["month"] = int(match.group(2)), month
+                date_match = match
+                break
+
+    if date_match is None:
+        date_match = RELATIVE_DAY.search(text)
+        if date_match is not None:
+            parts["day_offset"] = RELATIVE_DAYS[date_match.group(1)]
+
+    if date_match is not None:
+        if "day_offset" not in parts and date_match.group(3):
+            parts["year"] = int(date_match.group(3))
+        if "hour" not in parts:
+            rest = text[:date_match.start()] + " " + text[date_match.end():]
+            bare_hour = BARE_HOUR.search(rest)
+            if bare_hour:
+                parts["bare_hour"] = int(bare_hour.group(1))
+        return parts
+
+    lone_day = LONE_DAY.match(text.strip())
+    if lone_day:
+        parts["day"] = int(lone_day.group(1))
+
+    return parts
+
+
+def _infer_year(month: int, reference: date) -> int:
+    # Google Events only lists upcoming events: a month already past
+    # this year means next year.
+    if month < reference.month:
+        return reference.year + 1
+    return reference.year
+
+
+def _build(parts: dict, reference: date):
+    if "day" not in parts or "month" not in parts:
+        return None
+    year = parts.get("year") or _infer_year(parts["month"], reference)
+    try:
+        return datetime(
+            year, parts["month"], parts["day"],
+            parts.get("hour", 0), parts.get("minute", 0)
+        )
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_range_cached(date_str: str, reference: date):
+    for broken, dash in MOJIBAKE.items():
+        date_str = date_str.replace(broken, dash)
+    text = _strip_accents(date_str).lower()
+    text = TIMEZONE_SUFFIX.sub(" ", text).replace(" uhr", " ")
+
+    sides = RANGE_SEPARATOR.split(text, maxsplit=1)
+    left = _parse_side(sides[0])
+    right = _parse_side(sides[1]) if len(sides) > 1 else {}
+
+    for side in (left, right):
+        if "day_offset" in side:
+            day = reference + timedelta(days=side.pop("day_offset"))
+            side["day"], side["month"], side["year"] = day.day, day.month, day.year
+
+    # "7:30 – 9:30 PM" / "7 – 10 PM": the start takes the end's am/pm,
+    # unless that would put it after the end ("11:00 – 1:00 PM")
+    meridiem = right.get("meridiem")
+    if meridiem and "meridiem" not in left:
+        if "hour" not in left and "bare_hour" in left:
+            left["hour"], left["minute"] = left["bare_hour"], 0
+        if "hour" in left:
+            hour = _apply_meridiem(left["hour"], meridiem)
+            if (hour, left["minute"]) <= (right["hour"], right["minute"]):
+                left["hour"] = hour
+
+    # "14:00–16:00": the end inherits the start date
+    # "12.–14. Jan. 2026" / "9–19 may": the start inherits month and year
+    if right and "month" not in right and "month" in left:
+        right = {**{k: left[k] for k in ("day", "month", "year") if k in left}, **right}
+    if right and "month" not in left and "month" in right:
+        left = {**{k: right[k] for k in ("month", "year") if k in right}, **left}
+    if "year" in right and "year" not in left and "month" in left:
+        year = right["year"]
+        left["year"] = year - 1 if left["month"] > right["month"] else year
+
+    start = _build(left, reference)
+    end = _build(right, reference) if right else None
+
+    if start is None:
+        return None, None, None
+
+    if end is not None and end < start:
+        if end.date() < start.date() and "year" not in right:
+            # "28 Dec – 3 Jan": the range crosses the new year
+            end = _build({**right, "year": start.year + 1}, reference) or end
+        elif end.date() == start.date():
+            # overnight slot, e.g. 22:00–01:00
+            end += timedelta(days=1)
+
+    duration = (end - start).total_seconds() / 3600 if end else None
+    return start, end, duration
+
+
+def parse_date_range(date_str, reference=None):
+    """
+    Parse a Google Events "when" string into (start, end, duration_h).
+
+    Handles the shapes returned for the scraped languages, e.g.
+    "Thu 15 Jan, 14:00–16:00", "Sa., 17. Jan., 14:00–16:00 Uhr",
+    "Sat 24 Jan, 10:00 – Sun 25 Jan, 17:00", "9–19 may 2026".
+    Missing years are inferred from `reference` (default: today).
+    Results are memoized per (string, reference day).
+    """
+    if not isinstance(date_str, str) or not date_str.strip():
+        return None, None, None
+
+    if reference is None:
+        reference = date.today()
+    elif isinstance(reference, datetime):
+        reference = reference.date()
+
+    return _parse_date_range_cached(date_str.strip(), reference)
+
+
+if __name__ == "__main__":
+    failures = 0
+    for raw, expected in DATE_RANGE_EXAMPLES:
+        result = parse_date_range(raw, date(2026, 1, 10))
+        if result != expected:
+            failures += 1
+            print("ÉCHEC :", repr(raw), result, "!=", expected)
+    print(f"{len(DATE_RANGE_EXAMPLES) - failures}/{len(DATE_RANGE_EXAMPLES)} exemples OK")
@@ -0,0 +1,90 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from flask import g, request
+from utils.data_utils import canonical_params
+
+# =================================================
+# CONFIGURATION (OPT-IN)
+# =================================================
+#
+# QUERY_LOG_PATH        : JSONL file, logging disabled if unset
+# QUERY_LOG_MAX_BYTES   : rotation size (default 10 MB)
+# QUERY_LOG_BACKUPS     : rotated files kept (default 5)
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUPS = 5
+
+LOGGER_NAME = "citymatch.query_log"
+
+
+# =================================================
+# MIDDLEWARE
+# =================================================
+
+def init_query_log(app, path=None):
+    """
+    Append one JSON line per /api/ request: endpoint, canonical params,
+    status, latency and result size (bytes, plus the number of results
+    when the handler sets g.query_log_result_count). Does nothing unless
+    a path is given or QUERY_LOG_PATH is set.
+    """
+    path = path or os.getenv("QUERY_LOG_PATH")
+    if not path:
+        return None
+
+    path = os.path.abspath(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    # the logger is process-wide: a second app instance (app factory,
+    # tests, in-process replay) must not write every line twice
+    already_attached = any(
+        isinstance(h, RotatingFileHandler) and h.baseFilename == path
+        for h in logger.handlers
+    )
+    if not already_attached:
+        handler = RotatingFileHandler(
+            path,
+            maxBytes=int(os.getenv("QUERY_LOG_MAX_BYTES", DEFAULT_MAX_BYTES)),
+            backupCount=int(os.getenv("QUERY_LOG_BACKUPS", DEFAULT_BACKUPS)),
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+
+    @app.before_request
+    def _start_timer():
+        g.query_log_start = time.perf_counter()
+
+    @app.after_request
+    def _log_query(response):
+        start = g.pop("query_log_start", None)
+        if start is None or not request.path.startswith("/api/"):
+            return response
+
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        # set by the handlers that produce the results (body not re-parsed)
+        result_count = g.pop("query_log_result_count", None)
+
+        logger.info(json.dumps({
+            "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "path": request.path,
+            "params": canonical_params(request.args),
+            "status": response.status_code,
+            "latency_ms": round(latency_ms, 2),
+            "result_count": result_count,
+            "bytes": response.content_length,
+        }, ensure_ascii=False))
+
+        return response
+
+    print("Query log :", path)
+    return logger
@@ -0,0 +1,74 @@
+import os
+import threading
+
+
+# =================================================
+# SINGLE-FLIGHT (REQUEST COALESCING)
+# =================================================
+#
+# Concurrent calls with the same key share one computation: the first
+# caller (leader) runs it, the others wait and receive the same result.
+# Nothing is kept once the computation finishes, so results are never
+# stale. Works between the threads of a worker (gunicorn gthread); each
+# worker process coalesces its own requests.
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._leaders = 0
+        self._coalesced = 0
+        self._errors = 0
+
+    def do(self, key, compute):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._leaders += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = compute()
+        except BaseException as e:
+            # also KeyboardInterrupt / SystemExit: followers must not
+            # mistake a missing result for None
+            call.error = e
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._leaders + self._coalesced
+            return {
+                "pid": os.getpid(),
+                "requests": total,
+                "computed": self._leaders,
+                "coalesced": self._coalesced,
+                "coalesced_ratio": round(self._coalesced / total, 4) if total else 0.0,
+                "errors": self._errors,
+                "in_flight": len(self._calls),
+            }